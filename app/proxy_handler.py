@@ -16,7 +16,7 @@ from app.profiler import cleanup_profiler, create_profiler, get_profiler
 from app.request_modifiers import RequestModifier
 from app.response_modifiers import ResponseModifier
 from app.tool_handler import handle_tool_calls
-from app.utils import generate_request_id, get_client_ip
+from app.utils import generate_request_id, get_client_ip, sanitize_headers
 
 logger = structlog.get_logger()
 
@@ -161,8 +161,10 @@ async def proxy_request(
                 # Return pure streaming response with cleaned headers
                 # Clean headers to avoid conflicts with middleware
                 async with profiler.time_phase("Cleaning Direct Streaming Headers"):
+                    # Drop hop-by-hop headers (transfer-encoding, connection, ...) so
+                    # the server frames the re-streamed body itself
                     clean_headers = {}
-                    for key, value in upstream_response.headers.items():
+                    for key, value in sanitize_headers(upstream_response.headers).items():
                         # Skip headers that might conflict with middleware
                         if key.lower() not in ["server", "date"]:
                             clean_headers[key] = value
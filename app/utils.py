@@ -3,7 +3,7 @@ Utility functions for the AI Proxy Server
 """
 
 import uuid
-from typing import Optional
+from typing import Mapping, Optional
 
 from fastapi import Request
 
@@ -41,7 +41,7 @@ def get_client_ip(request: Request) -> Optional[str]:
     return None
 
 
-def sanitize_headers(headers: dict) -> dict:
+def sanitize_headers(headers: Mapping[str, str]) -> dict:
     """
     Sanitize headers before forwarding to upstream
     Removes hop-by-hop headers and sensitive information
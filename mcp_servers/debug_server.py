@@ -6,9 +6,10 @@ Returns predictable values to verify tool execution.
 """
 
 import asyncio
+import operator
 import time
 from datetime import datetime
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
@@ -21,183 +22,200 @@ call_counter = 0
 # Debug MCP server
 server = Server("debug-server")
 
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
-    """List available debug tools."""
-    return [
-        types.Tool(
-            name="get_debug_number",
-            description="Returns a specific debug number (42) - useful for testing tool calls",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
+# Supported debug_math operations
+_MATH_OPERATIONS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+}
+
+# Tool schemas are static, so build them once instead of on every tools/list
+_TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="get_debug_number",
+        description="Returns a specific debug number (42) - useful for testing tool calls",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        },
+    ),
+    types.Tool(
+        name="get_timestamp",
+        description="Returns current timestamp - useful for verifying fresh tool calls",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        },
+    ),
+    types.Tool(
+        name="echo_message",
+        description="Echoes back the provided message - useful for testing parameter passing",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "Message to echo back"
+                }
             },
-        ),
-        types.Tool(
-            name="get_timestamp",
-            description="Returns current timestamp - useful for verifying fresh tool calls",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            },
-        ),
-        types.Tool(
-            name="echo_message",
-            description="Echoes back the provided message - useful for testing parameter passing",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "message": {
-                        "type": "string",
-                        "description": "Message to echo back"
-                    }
+            "required": ["message"]
+        },
+    ),
+    types.Tool(
+        name="get_call_counter",
+        description="Returns an incrementing counter - useful for testing multiple calls",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        },
+    ),
+    types.Tool(
+        name="debug_math",
+        description="Performs simple math operation - useful for testing parameter handling",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "number",
+                    "description": "First number"
                 },
-                "required": ["message"]
-            },
-        ),
-        types.Tool(
-            name="get_call_counter",
-            description="Returns an incrementing counter - useful for testing multiple calls",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            },
-        ),
-        types.Tool(
-            name="debug_math",
-            description="Performs simple math operation - useful for testing parameter handling",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "a": {
-                        "type": "number",
-                        "description": "First number"
-                    },
-                    "b": {
-                        "type": "number",
-                        "description": "Second number"
-                    },
-                    "operation": {
-                        "type": "string",
-                        "enum": ["add", "subtract", "multiply", "divide"],
-                        "description": "Math operation to perform"
-                    }
+                "b": {
+                    "type": "number",
+                    "description": "Second number"
                 },
-                "required": ["a", "b", "operation"]
+                "operation": {
+                    "type": "string",
+                    "enum": ["add", "subtract", "multiply", "divide"],
+                    "description": "Math operation to perform"
+                }
             },
-        ),
+            "required": ["a", "b", "operation"]
+        },
+    ),
+]
+
+@server.list_tools()
+async def handle_list_tools() -> list[types.Tool]:
+    """List available debug tools."""
+    return _TOOLS
+
+async def _handle_debug_number(arguments: dict[str, Any] | None) -> list[types.TextContent]:
+    return [
+        types.TextContent(
+            type="text",
+            text="DEBUG_NUMBER: 42"
+        )
     ]
 
-@server.call_tool()
-async def handle_call_tool(name: str, arguments: dict[str, Any] | None) -> list[types.TextContent]:
-    """Handle tool calls."""
-    global call_counter
+async def _handle_timestamp(arguments: dict[str, Any] | None) -> list[types.TextContent]:
+    # Read the clock once so both representations describe the same instant
+    now = time.time()
+    timestamp = datetime.fromtimestamp(now).isoformat()
+    unix_time = int(now)
+    return [
+        types.TextContent(
+            type="text",
+            text=f"TIMESTAMP: {timestamp} (Unix: {unix_time})"
+        )
+    ]
 
-    if name == "get_debug_number":
+async def _handle_echo_message(arguments: dict[str, Any] | None) -> list[types.TextContent]:
+    if not arguments or "message" not in arguments:
         return [
             types.TextContent(
                 type="text",
-                text="DEBUG_NUMBER: 42"
+                text="ERROR: No message provided to echo"
             )
         ]
+    message = arguments["message"]
+    return [
+        types.TextContent(
+            type="text",
+            text=f"ECHO: {message}"
+        )
+    ]
+
+async def _handle_call_counter(arguments: dict[str, Any] | None) -> list[types.TextContent]:
+    global call_counter
+    call_counter += 1
+    return [
+        types.TextContent(
+            type="text",
+            text=f"CALL_COUNTER: {call_counter}"
+        )
+    ]
 
-    elif name == "get_timestamp":
-        timestamp = datetime.now().isoformat()
-        unix_time = int(time.time())
+async def _handle_debug_math(arguments: dict[str, Any] | None) -> list[types.TextContent]:
+    if not arguments:
         return [
             types.TextContent(
                 type="text",
-                text=f"TIMESTAMP: {timestamp} (Unix: {unix_time})"
+                text="ERROR: No arguments provided for math operation"
             )
         ]
 
-    elif name == "echo_message":
-        if not arguments or "message" not in arguments:
+    try:
+        a = float(arguments.get("a", 0))
+        b = float(arguments.get("b", 0))
+        operation = arguments.get("operation", "add")
+
+        math_op = _MATH_OPERATIONS.get(operation)
+        if math_op is None:
             return [
                 types.TextContent(
                     type="text",
-                    text="ERROR: No message provided to echo"
+                    text=f"ERROR: Unknown operation '{operation}'"
                 )
             ]
-        message = arguments["message"]
+        if math_op is operator.truediv and b == 0:
+            return [
+                types.TextContent(
+                    type="text",
+                    text="ERROR: Cannot divide by zero"
+                )
+            ]
+        result = math_op(a, b)
+
         return [
             types.TextContent(
                 type="text",
-                text=f"ECHO: {message}"
+                text=f"MATH_RESULT: {a} {operation} {b} = {result}"
             )
         ]
 
-    elif name == "get_call_counter":
-        call_counter += 1
+    except (ValueError, TypeError) as e:
         return [
             types.TextContent(
                 type="text",
-                text=f"CALL_COUNTER: {call_counter}"
+                text=f"ERROR: Invalid number format - {str(e)}"
             )
         ]
 
-    elif name == "debug_math":
-        if not arguments:
-            return [
-                types.TextContent(
-                    type="text",
-                    text="ERROR: No arguments provided for math operation"
-                )
-            ]
-
-        try:
-            a = float(arguments.get("a", 0))
-            b = float(arguments.get("b", 0))
-            operation = arguments.get("operation", "add")
-
-            if operation == "add":
-                result = a + b
-            elif operation == "subtract":
-                result = a - b
-            elif operation == "multiply":
-                result = a * b
-            elif operation == "divide":
-                if b == 0:
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text="ERROR: Cannot divide by zero"
-                        )
-                    ]
-                result = a / b
-            else:
-                return [
-                    types.TextContent(
-                        type="text",
-                        text=f"ERROR: Unknown operation '{operation}'"
-                    )
-                ]
-
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"MATH_RESULT: {a} {operation} {b} = {result}"
-                )
-            ]
-
-        except (ValueError, TypeError) as e:
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"ERROR: Invalid number format - {str(e)}"
-                )
-            ]
+# Tool name -> handler, so dispatch is a single lookup
+_HANDLERS: dict[str, Callable[[dict[str, Any] | None], Awaitable[list[types.TextContent]]]] = {
+    "get_debug_number": _handle_debug_number,
+    "get_timestamp": _handle_timestamp,
+    "echo_message": _handle_echo_message,
+    "get_call_counter": _handle_call_counter,
+    "debug_math": _handle_debug_math,
+}
 
-    else:
+@server.call_tool()
+async def handle_call_tool(name: str, arguments: dict[str, Any] | None) -> list[types.TextContent]:
+    """Handle tool calls."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
         return [
             types.TextContent(
                 type="text",
                 text=f"ERROR: Unknown tool '{name}'"
             )
         ]
+    return await handler(arguments)
 
 async def main():
     # Use stdio for communication
@@ -1,9 +1,29 @@
 """Example User Plugin demonstrating the registry system."""
 
+from functools import lru_cache
 from typing import Any, Dict
 
 from app.plugin_system.registry import register_plugin
 
+# Values that are the same for every request/response this plugin touches
+STATIC_HEADERS = {
+    "X-User-Plugin": "example_user_plugin_v1.0.0",
+    "X-Plugin-Type": "user_created",
+}
+STATIC_RESPONSE_METADATA = {
+    "processed_by": "example_user_plugin",
+    "plugin_type": "user_created",
+    "message": "This response was enhanced by a user plugin!",
+}
+
+
+# Complete header sets per endpoint. The endpoint is the client-supplied path from
+# the catch-all routes, so the cache is bounded to keep unknown paths from piling up.
+@lru_cache(maxsize=128)
+def _headers_for(endpoint: str) -> Dict[str, str]:
+    """Get the headers to add for an endpoint; callers must not mutate the result."""
+    return {**STATIC_HEADERS, "X-Processed-Endpoint": endpoint}
+
 
 @register_plugin(
     name="example_user_plugin",
@@ -17,12 +37,9 @@ def add_custom_header(
     request_data: Dict[str, Any], context: Dict[str, Any]
 ) -> Dict[str, Any]:
     """Add a custom header to identify this as a user-modified request."""
-    if "headers" not in request_data:
-        request_data["headers"] = {}
-
-    request_data["headers"]["X-User-Plugin"] = "example_user_plugin_v1.0.0"
-    request_data["headers"]["X-Plugin-Type"] = "user_created"
-    request_data["headers"]["X-Processed-Endpoint"] = context.get("endpoint", "unknown")
+    request_data.setdefault("headers", {}).update(
+        _headers_for(context.get("endpoint", "unknown"))
+    )
 
     return request_data
 
@@ -39,16 +56,8 @@ def add_response_metadata(
     response_data: Dict[str, Any], context: Dict[str, Any]
 ) -> Dict[str, Any]:
     """Add metadata to show this response was processed by a user plugin."""
-    if "user_plugin_info" not in response_data:
-        response_data["user_plugin_info"] = {}
-
-    response_data["user_plugin_info"]["processed_by"] = "example_user_plugin"
-    response_data["user_plugin_info"]["plugin_type"] = "user_created"
-    response_data["user_plugin_info"][
-        "message"
-    ] = "This response was enhanced by a user plugin!"
-    response_data["user_plugin_info"]["processed_endpoint"] = context.get(
-        "endpoint", "unknown"
-    )
+    plugin_info = response_data.setdefault("user_plugin_info", {})
+    plugin_info.update(STATIC_RESPONSE_METADATA)
+    plugin_info["processed_endpoint"] = context.get("endpoint", "unknown")
 
     return response_data
@@ -3,39 +3,81 @@
 Test script for MCP tool calling flow
 """
 
+import argparse
 import asyncio
+import io
 import json
+import re
+import time
+import traceback
+from pathlib import Path
+from typing import Optional
 
 import httpx
 
+# /mcp/status is cached on disk briefly so quick repeat runs skip the round trip
+STATUS_CACHE_PATH = Path.home() / ".cache" / "ai_proxy_tests" / "mcp_status.json"
+STATUS_CACHE_TTL = 30.0  # seconds
 
-async def test_mcp_flow() -> None:
+# Markers that show Context7 documentation made it into an answer
+CONTEXT7_PATTERNS = re.compile(r"Selected Library|library ID|/tiangolo/fastapi")
+
+
+def load_cached_status() -> Optional[dict]:
+    """Load the cached MCP status if it is still fresh"""
+    try:
+        if time.time() - STATUS_CACHE_PATH.stat().st_mtime < STATUS_CACHE_TTL:
+            return json.loads(STATUS_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def save_cached_status(status: dict) -> None:
+    """Write the MCP status to the cache, ignoring failures"""
+    try:
+        STATUS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        STATUS_CACHE_PATH.write_text(json.dumps(status))
+    except OSError:
+        pass
+
+
+async def test_mcp_flow(use_cache: bool = True) -> None:
     """Test the MCP tool calling flow"""
 
     # Start the proxy server first (run separately)
     proxy_url = "http://localhost:8000"
 
-    async with httpx.AsyncClient() as client:
+    # One pooled client for every request so later tests reuse the connection
+    async with httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    ) as client:
         # 1. Check MCP status
         print("🔍 Checking MCP status...")
-        try:
-            response = await client.get(f"{proxy_url}/mcp/status")
-            if response.status_code == 200:
-                status = response.json()
-                print(f"✅ Connected servers: {status.get('connected_servers', 0)}")
-                print(f"✅ Available tools: {status.get('total_tools', 0)}")
-                for tool in status.get("tools", []):
-                    print(f"   - {tool['name']}: {tool['description'][:100]}...")
-            else:
-                print(f"❌ MCP status failed: {response.status_code}")
+        status = load_cached_status() if use_cache else None
+        if status is not None:
+            print("♻️ Using cached MCP status (run with --no-cache to refresh)")
+        else:
+            try:
+                response = await client.get(f"{proxy_url}/mcp/status")
+                if response.status_code == 200:
+                    status = response.json()
+                    if use_cache:
+                        save_cached_status(status)
+                else:
+                    print(f"❌ MCP status failed: {response.status_code}")
+                    return
+            except Exception as e:
+                print(f"❌ Could not connect to proxy: {e}")
                 return
-        except Exception as e:
-            print(f"❌ Could not connect to proxy: {e}")
-            return
 
-        # 2. Test chat completion with weather tools
-        print("\n🌤️ Testing weather tool...")
+        print(f"✅ Connected servers: {status.get('connected_servers', 0)}")
+        print(f"✅ Available tools: {status.get('total_tools', 0)}")
+        for tool in status.get("tools", []):
+            print(f"   - {tool['name']}: {tool['description'][:100]}...")
 
+        # 2-4. Weather, Context7, and explicit Context7 tool tests
         weather_request = {
             "model": "gpt-4",
             "messages": [
@@ -47,11 +89,6 @@ async def test_mcp_flow() -> None:
             "temperature": 0.7,
         }
 
-        await run_test_request(client, proxy_url, weather_request, "Weather test")
-
-        # 3. Test Context7 tools
-        print("\n📚 Testing Context7 documentation tools...")
-
         context7_request = {
             "model": "gpt-4-turbo",
             "messages": [
@@ -63,13 +100,6 @@ async def test_mcp_flow() -> None:
             "temperature": 0.7,
         }
 
-        await run_detailed_test_request(
-            client, proxy_url, context7_request, "Context7 brief test"
-        )
-
-        # 4. Test Context7 with explicit mention
-        print("\n📚 Testing Context7 with explicit instruction...")
-
         context7_explicit_request = {
             "model": "gpt-4-turbo",
             "messages": [
@@ -81,22 +111,64 @@ async def test_mcp_flow() -> None:
             "temperature": 0.7,
         }
 
-        await run_test_request(
-            client, proxy_url, context7_explicit_request, "Context7 explicit test"
+        # The tests are independent, so run them concurrently over the pooled client
+        # and print their reports in request order once all have finished
+        reports = await asyncio.gather(
+            run_test(
+                client,
+                proxy_url,
+                weather_request,
+                "Weather test",
+                "\n🌤️ Testing weather tool...",
+            ),
+            run_test(
+                client,
+                proxy_url,
+                context7_request,
+                "Context7 brief test",
+                "\n📚 Testing Context7 documentation tools...",
+                timeout=60.0,  # Longer timeout for Context7
+                detailed=True,
+            ),
+            run_test(
+                client,
+                proxy_url,
+                context7_explicit_request,
+                "Context7 explicit test",
+                "\n📚 Testing Context7 with explicit instruction...",
+            ),
         )
-
-
-async def run_test_request(client, proxy_url, test_request, test_name) -> None:
-    """Helper function to run a test request"""
+        for report in reports:
+            print(report, end="")
+
+
+async def run_test(
+    client: httpx.AsyncClient,
+    proxy_url: str,
+    test_request: dict,
+    test_name: str,
+    heading: str,
+    *,
+    timeout: float = 30.0,
+    detailed: bool = False,
+) -> str:
+    """Helper function to run a test request and return its printed report
+
+    With detailed=True, remaining tool calls are listed one per line, the answer is
+    scanned for Context7 patterns and token usage is checked for retrieved docs.
+    """
+    # Buffer output so tests running concurrently don't interleave
+    out = io.StringIO()
+    print(heading, file=out)
     try:
         response = await client.post(
             f"{proxy_url}/v1/chat/completions",
             json=test_request,
             headers={"Content-Type": "application/json"},
-            timeout=30.0,  # 30 second timeout
+            timeout=timeout,
         )
 
-        print(f"📡 Response status: {response.status_code}")
+        print(f"📡 Response status: {response.status_code}", file=out)
 
         if response.status_code == 200:
             result = response.json()
@@ -105,92 +177,34 @@ async def run_test_request(client, proxy_url, test_request, test_name) -> None:
             if "choices" in result and result["choices"]:
                 message = result["choices"][0]["message"]
                 if message.get("tool_calls"):
-                    print("❌ Still got tool calls instead of final answer")
-                    print("Tool calls:", json.dumps(message["tool_calls"], indent=2))
-                else:
-                    print("✅ Got final answer:")
-                    content = message.get("content", "No content")
-                    # Truncate long responses for readability
-                    if len(content) > 200:
-                        print(f"Assistant: {content[:200]}...")
+                    print("❌ Still got tool calls instead of final answer", file=out)
+                    if detailed:
+                        print("Remaining tool calls:", file=out)
+                        for tool_call in message["tool_calls"]:
+                            print(
+                                f"  - {tool_call['function']['name']}: {tool_call['function'].get('arguments', {})}",
+                                file=out,
+                            )
                     else:
-                        print(f"Assistant: {content}")
-
-                    # Check usage stats
-                    if "usage" in result:
-                        usage = result["usage"]
                         print(
-                            f"📊 Tokens used: {usage.get('total_tokens', 0)} "
-                            + f"(prompt: {usage.get('prompt_tokens', 0)}, "
-                            + f"completion: {usage.get('completion_tokens', 0)})"
-                        )
-            else:
-                print("❌ No choices in response")
-                print(f"Raw response: {result}")
-        else:
-            print(f"❌ {test_name} failed: {response.status_code}")
-            try:
-                error_details = response.json()
-                print(f"Error details: {json.dumps(error_details, indent=2)}")
-            except Exception:
-                print(f"Raw error response: {response.text}")
-
-    except httpx.TimeoutException:
-        print(f"❌ {test_name} timed out (>30s)")
-    except httpx.RequestError as e:
-        print(f"❌ Network error: {e}")
-    except Exception as e:
-        print(f"❌ {test_name} error: {e}")
-        print(f"Error type: {type(e).__name__}")
-        import traceback
-
-        traceback.print_exc()
-
-    print()  # Add spacing between tests
-
-
-async def run_detailed_test_request(client, proxy_url, test_request, test_name) -> None:
-    """Helper function to run a test request with detailed tool call logging"""
-    try:
-        response = await client.post(
-            f"{proxy_url}/v1/chat/completions",
-            json=test_request,
-            headers={"Content-Type": "application/json"},
-            timeout=60.0,  # Longer timeout for Context7
-        )
-
-        print(f"📡 Response status: {response.status_code}")
-
-        if response.status_code == 200:
-            result = response.json()
-
-            # Check if we got a final answer (not tool calls)
-            if "choices" in result and result["choices"]:
-                message = result["choices"][0]["message"]
-                if message.get("tool_calls"):
-                    print("❌ Still got tool calls instead of final answer")
-                    print("Remaining tool calls:")
-                    for tool_call in message["tool_calls"]:
-                        print(
-                            f"  - {tool_call['function']['name']}: {tool_call['function'].get('arguments', {})}"
+                            "Tool calls:",
+                            json.dumps(message["tool_calls"], indent=2),
+                            file=out,
                         )
                 else:
-                    print("✅ Got final answer:")
+                    print("✅ Got final answer:", file=out)
                     content = message.get("content", "No content")
 
                     # Look for Context7 patterns in the response
-                    if (
-                        "Selected Library" in content
-                        or "library ID" in content
-                        or "/tiangolo/fastapi" in content
-                    ):
-                        print("🔍 Context7 patterns detected in response")
-
-                    # Show first part of response
-                    if len(content) > 300:
-                        print(f"Assistant: {content[:300]}...")
+                    if detailed and CONTEXT7_PATTERNS.search(content):
+                        print("🔍 Context7 patterns detected in response", file=out)
+
+                    # Truncate long responses for readability
+                    preview_length = 300 if detailed else 200
+                    if len(content) > preview_length:
+                        print(f"Assistant: {content[:preview_length]}...", file=out)
                     else:
-                        print(f"Assistant: {content}")
+                        print(f"Assistant: {content}", file=out)
 
                     # Check usage stats - Context7 should use many tokens if it got docs
                     if "usage" in result:
@@ -199,43 +213,65 @@ async def run_detailed_test_request(client, proxy_url, test_request, test_name)
                         print(
                             f"📊 Tokens used: {total_tokens} "
                             + f"(prompt: {usage.get('prompt_tokens', 0)}, "
-                            + f"completion: {usage.get('completion_tokens', 0)})"
+                            + f"completion: {usage.get('completion_tokens', 0)})",
+                            file=out,
                         )
 
-                        if total_tokens > 2000:
+                        if detailed and total_tokens > 2000:
                             print(
-                                "✅ High token usage suggests real documentation was retrieved"
+                                "✅ High token usage suggests real documentation was retrieved",
+                                file=out,
                             )
-                        else:
+                        elif detailed:
                             print(
-                                "⚠️ Low token usage - may not have retrieved full documentation"
+                                "⚠️ Low token usage - may not have retrieved full documentation",
+                                file=out,
                             )
             else:
-                print("❌ No choices in response")
-                print(f"Raw response: {result}")
+                print("❌ No choices in response", file=out)
+                print(f"Raw response: {result}", file=out)
         else:
-            print(f"❌ {test_name} failed: {response.status_code}")
+            print(f"❌ {test_name} failed: {response.status_code}", file=out)
+            # The body is already buffered by client.post; parse it once and fall
+            # back to the raw text when the error is not JSON
             try:
                 error_details = response.json()
-                print(f"Error details: {json.dumps(error_details, indent=2)}")
-            except Exception:
-                print(f"Raw error response: {response.text}")
+            except ValueError:
+                print(f"Raw error response: {response.text}", file=out)
+            else:
+                print(f"Error details: {json.dumps(error_details, indent=2)}", file=out)
 
     except httpx.TimeoutException:
-        print(f"❌ {test_name} timed out (>60s)")
+        print(f"❌ {test_name} timed out (>{timeout:g}s)", file=out)
     except httpx.RequestError as e:
-        print(f"❌ Network error: {e}")
+        print(f"❌ Network error: {e}", file=out)
     except Exception as e:
-        print(f"❌ {test_name} error: {e}")
-        print(f"Error type: {type(e).__name__}")
-        import traceback
-
-        traceback.print_exc()
+        print(f"❌ {test_name} error: {e}", file=out)
+        print(f"Error type: {type(e).__name__}", file=out)
+        traceback.print_exc(file=out)
 
-    print()  # Add spacing between tests
+    print(file=out)  # Add spacing between tests
+    return out.getvalue()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test the MCP tool calling flow")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch /mcp/status instead of reusing a recent cached copy",
+    )
+    args = parser.parse_args()
+
     print("🚀 Testing MCP Tool Calling Flow")
     print("=" * 40)
-    asyncio.run(test_mcp_flow())
+
+    # uvloop comes with uvicorn[standard] but is not available on every platform
+    try:
+        import uvloop
+    except ImportError:
+        run = asyncio.run
+    else:
+        run = uvloop.run
+
+    run(test_mcp_flow(use_cache=not args.no_cache))